@@ -0,0 +1,36 @@
+"""
+This module provides the base64 encoder used across the package.
+pybase64's simd encoder is used when it is installed, otherwise the standard
+library is used. The encoder is only imported once something is encoded
+"""
+
+import functools
+import typing
+
+
+@functools.cache
+def _encoder() -> typing.Callable[[typing.Any], str]:
+    """
+    imports the base64 encoder, preferring pybase64's simd encoder
+
+    :return: a function base64 encoding a bytes-like object to a string
+    """
+    # pylint: disable=import-outside-toplevel
+    try:
+        from pybase64 import b64encode_as_string
+    except ImportError:  # pragma: no cover
+        import base64
+
+        return lambda data: base64.b64encode(data).decode("ascii")
+
+    return b64encode_as_string
+
+
+def b64encode(data: typing.Any) -> str:
+    """
+    Encodes data to a base64 string
+
+    :param data: a bytes-like object, such as bytes or a memory map
+    :return: the base64 encoded data as an ascii string
+    """
+    return _encoder()(data)
@@ -0,0 +1,58 @@
+"""
+This module provides the json encoder and decoder used across the package.
+orjson is used when it is installed, otherwise the standard library is used
+"""
+
+import typing
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+if orjson is not None:
+
+    def dumps(obj: typing.Any) -> bytes:
+        """
+        Serializes an object to compact json
+
+        :param obj: the object to serialize
+        :return: the utf-8 encoded json document
+        """
+        # the standard library converts int, float, bool and None keys to
+        # strings, orjson only does so with OPT_NON_STR_KEYS
+        # pylint: disable-next=no-member
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(data: bytes | str) -> typing.Any:
+        """
+        Deserializes a json document
+
+        :param data: the json document as bytes or a string
+        :return: the decoded python object
+        """
+        return orjson.loads(data)  # pylint: disable=no-member
+
+else:  # pragma: no cover
+    import json
+
+    def dumps(obj: typing.Any) -> bytes:
+        """
+        Serializes an object to compact json
+
+        :param obj: the object to serialize
+        :return: the utf-8 encoded json document
+        """
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode(
+            "utf-8"
+        )
+
+    def loads(data: bytes | str) -> typing.Any:
+        """
+        Deserializes a json document
+
+        :param data: the json document as bytes or a string
+        :return: the decoded python object
+        """
+        return json.loads(data)
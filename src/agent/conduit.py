@@ -2,10 +2,94 @@
 This module is in charge of sending and executing commands through the Agent CLI
 """
 
-import json
+import functools
+import os
+import shutil
 import subprocess
+import tempfile
+import typing
+from ._base64 import b64encode
+from ._json import dumps, loads
 from .config.operation import Operation, BrowserOperations, LLMOperations
 
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+# the agent cli reads its config from a path. posix platforms expose the cli's
+# stdin as /dev/stdin, so the config is piped to it, otherwise it is passed
+# base64 encoded as an argument. The cli's stdin is always a new pipe, so this
+# does not depend on whether the importing process has a stdin
+_STDIN_PATH = "/dev/stdin"
+_PIPE_CONFIG = os.name == "posix"
+
+# windows caps a command line at 32,767 characters, larger configs are written
+# to a temporary file instead of being passed as an argument
+_MAX_ARG_CONFIG = 16 * 1024
+
+# temporary config files of processes started by run_async, removed by gather
+_TEMP_CONFIGS: dict[subprocess.Popen, str] = {}
+
+_LOADERS = {"browser": BrowserOperations.load, "llm": LLMOperations.load}
+
+
+def _read_operations(config_path: str) -> list[dict]:
+    """
+    reads and decodes the raw operations of a json config
+
+    :param config_path: path to the json file
+    :return: the operation dictionaries of the config
+    """
+    with open(config_path, "rb") as file:
+        return loads(file.read())["operations"]
+
+
+@functools.cache
+def _executable(name: str) -> str:
+    """
+    resolves a cli on the PATH once, so later spawns skip the PATH search
+
+    :param name: the name of the cli
+    :return: the path to the cli, or its name if it is not on the PATH
+    """
+    return shutil.which(name) or name
+
+
+def _write_temp_config(payload: bytes) -> str:
+    """
+    writes a serialized config to a new temporary file, the caller removes it
+
+    :param payload: the serialized config
+    :return: the path to the temporary file
+    """
+    fd, path = tempfile.mkstemp(suffix=".json")
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view) :]
+    except BaseException:
+        os.close(fd)
+        os.remove(path)
+        raise
+
+    os.close(fd)
+    return path
+
+
+def _load_operation(opt: dict) -> Operation:
+    """
+    constructs an operation from its config dictionary
+
+    :param opt: the dictionary representation of the operation
+    :return: the operation
+    """
+    loader = _LOADERS.get(opt["type"])
+    if loader is None:
+        raise TypeError(f"{opt['type']} is not a valid operation type")
+
+    return loader(opt)
+
 
 def load_config(config_path: str) -> list[Operation]:
     """
@@ -15,25 +99,40 @@ def load_config(config_path: str) -> list[Operation]:
     :return: a list of operations
     """
 
-    with open(config_path, "r", encoding="utf-8") as file:
-        data = json.load(file)
+    op_list = [_load_operation(opt) for opt in _read_operations(config_path)]
+    # browser operations come first, the sort is stable so file order is
+    # kept within each type
+    op_list.sort(key=lambda op: op.op_type != "browser")
 
-        operations = data["operations"]
+    return op_list
+
+
+def iter_config(config_path: str) -> typing.Iterator[Operation]:
+    """
+    lazily converts a json file to operations, in the order they appear in the file.
+    When ijson is installed the file is stream parsed, so only one operation is
+    held in memory at a time
+
+    :param config_path: path to the json file
+    :return: an iterator over the operations
+    """
 
-        browser_list = []
-        llm_list = []
+    if ijson is None:
+        yield from map(_load_operation, _read_operations(config_path))
+        return
 
-        for opt in operations:
-            match opt["type"]:
-                case "browser":
-                    browser_list.append(BrowserOperations.load(opt))
-                case "llm":
-                    llm_list.append(LLMOperations.load(opt))
-                case _:
-                    raise TypeError(f"{opt['type']} is not a valid operation type")
+    with open(config_path, "rb") as file:
+        empty = True
+        for opt in ijson.items(file, "operations.item", use_float=True):
+            empty = False
+            yield _load_operation(opt)
 
-        op_list = browser_list + llm_list
-        return op_list
+        # a missing operations key also yields nothing, raise for it like the
+        # decoded config does
+        if empty:
+            file.seek(0)
+            if ("", "map_key", "operations") not in ijson.parse(file):
+                raise KeyError("operations")
 
 
 class Conduit:
@@ -41,11 +140,79 @@ class Conduit:
     Class based interface for the agent cli
     """
 
-    def __init__(self, config: list[Operation]):
+    def __init__(self, config: list[Operation], cache: bool = False):
         """
         :param config: The list of operations to execute
+        :param cache: reuse the serialized config across runs. Only enable this
+        when the operations are not modified in place, or call invalidate after
+        modifying them
+        """
+        self._config = config
+        self._cache = cache
+        self._serialized: bytes | None = None
+
+    @property
+    def config(self) -> list[Operation]:
+        """
+        The list of operations to execute
+        :return: the operations
+        """
+        return self._config
+
+    @config.setter
+    def config(self, config: list[Operation]):
         """
-        self.config = config
+        Replaces the operations to execute
+
+        :param config: The list of operations to execute
+        """
+        self._config = config
+        self._serialized = None
+
+    def invalidate(self):
+        """
+        Discards the cached serialized config. Call this after modifying
+        the operations in place so the next run picks up the changes
+        """
+        self._serialized = None
+
+    def serialize(self) -> bytes:
+        """
+        Serializes the config to the json document sent to the Agent CLI.
+        When caching is enabled the result is reused until the config is
+        replaced or invalidated
+
+        :return: the config as json bytes
+        """
+        if self._serialized is not None:
+            return self._serialized
+
+        serialized = dumps(
+            {"operations": [operation.to_dict() for operation in self._config]}
+        )
+        if self._cache:
+            self._serialized = serialized
+
+        return serialized
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _fetch_version() -> str:
+        """
+        Queries the Agent CLI for its version. The version cannot change while
+        the process is running, so the result is cached, use
+        Conduit._fetch_version.cache_clear() to query the CLI again
+
+        :return: the output of the version command
+        """
+        version = subprocess.run(
+            [_executable("config"), "version"], capture_output=True, check=True
+        )
+
+        if not version.stdout.startswith(b"Version"):
+            raise ValueError("Agent CLI not found")
+
+        return version.stdout.decode("utf-8")
 
     @classmethod
     def version(cls, verbose=False) -> str:
@@ -54,44 +221,150 @@ class Conduit:
         :param verbose: prints the version to the console
         :return:
         """
-        version = subprocess.run(
-            ["config", "version"], capture_output=True, text=True, check=True
-        )
-
-        response: str = version.stdout
+        response = cls._fetch_version()
 
         if verbose:
             print(response)
 
-        if response.startswith("Version"):
-            return response
-
-        raise ValueError("Agent CLI not found")
+        return response
 
-    def run(self, verbose=False) -> str:
+    def run(self, verbose=False, capture=True) -> str:
         """
         Runs the config
 
         :param verbose: print the stdout
+        :param capture: capture the stdout, when False the stdout is discarded
+        and an empty string is returned. stderr is always captured for errors
         :return: the stdout
         """
-        command_list = ["agent", "run"]
+        payload = self.serialize()
+        stdout = subprocess.PIPE if capture else subprocess.DEVNULL
 
-        config = []
-        for operation in self.config:
-            config.append(operation.to_dict())
+        if _PIPE_CONFIG:
+            console_out = subprocess.run(
+                (_executable("agent"), "run", _STDIN_PATH),
+                input=payload,
+                stdout=stdout,
+                stderr=subprocess.PIPE,
+                check=False,
+            )
+        elif len(payload) <= _MAX_ARG_CONFIG:
+            console_out = subprocess.run(
+                (_executable("agent"), "run", "-b", b64encode(payload)),
+                stdout=stdout,
+                stderr=subprocess.PIPE,
+                check=False,
+            )
+        else:
+            config_path = _write_temp_config(payload)
+            try:
+                console_out = subprocess.run(
+                    (_executable("agent"), "run", config_path),
+                    stdout=stdout,
+                    stderr=subprocess.PIPE,
+                    check=False,
+                )
+            finally:
+                os.remove(config_path)
 
-        with open("./temp-config.json", "w", encoding="utf-8") as file:
-            json.dump({"operations": config}, file)
+        return self._read_output(
+            console_out.stdout if capture else b"",
+            console_out.stderr,
+            verbose and capture,
+        )
 
-        command_list.append("./temp-config.json")
-        console_out = subprocess.run(
-            command_list, capture_output=True, text=True, check=False
+    def run_async(self) -> subprocess.Popen:
+        """
+        Starts running the config without waiting for the Agent CLI to finish,
+        so several configs can run at once. Collect the output with Conduit.gather,
+        which also removes the temporary config file large configs use off posix
+
+        :return: the running Agent CLI process
+        """
+        payload = self.serialize()
+
+        if not _PIPE_CONFIG and len(payload) <= _MAX_ARG_CONFIG:
+            return subprocess.Popen(  # pylint: disable=consider-using-with
+                (_executable("agent"), "run", "-b", b64encode(payload)),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+
+        if not _PIPE_CONFIG:
+            config_path = _write_temp_config(payload)
+            try:
+                process = subprocess.Popen(  # pylint: disable=consider-using-with
+                    (_executable("agent"), "run", config_path),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                )
+            except BaseException:
+                os.remove(config_path)
+                raise
+
+            _TEMP_CONFIGS[process] = config_path
+            return process
+
+        process = subprocess.Popen(  # pylint: disable=consider-using-with
+            (_executable("agent"), "run", _STDIN_PATH),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
         )
-        if console_out.stderr != "":
-            raise EnvironmentError(console_out.stderr)
+
+        # the pipe is closed here, so it is detached from the process, otherwise
+        # communicate would flush the closed pipe
+        pipe = process.stdin
+        process.stdin = None
+        # the cli may exit without reading its config, gather reports its stderr.
+        # Closing the pipe flushes the buffered payload, so it can fail too
+        try:
+            pipe.write(payload)
+        except BrokenPipeError:
+            pass
+        try:
+            pipe.close()
+        except BrokenPipeError:
+            pass
+
+        return process
+
+    @classmethod
+    def gather(cls, processes: list[subprocess.Popen], verbose=False) -> list[str]:
+        """
+        Waits for configs started with run_async to finish
+
+        :param processes: the processes returned by run_async
+        :param verbose: print the stdout of each process
+        :return: the stdout of each process, in the same order
+        """
+        outputs = []
+        for process in processes:
+            try:
+                outputs.append(process.communicate())
+            finally:
+                config_path = _TEMP_CONFIGS.pop(process, None)
+                if config_path is not None:
+                    os.remove(config_path)
+
+        return [cls._read_output(stdout, stderr, verbose) for stdout, stderr in outputs]
+
+    @staticmethod
+    def _read_output(stdout: bytes, stderr: bytes, verbose: bool) -> str:
+        """
+        Checks the captured output of an Agent CLI run
+
+        :param stdout: the captured stdout
+        :param stderr: the captured stderr
+        :param verbose: print the stdout
+        :return: the decoded stdout
+        """
+        if stderr.strip():
+            raise EnvironmentError(stderr.decode("utf-8"))
+
+        response = stdout.decode("utf-8")
 
         if verbose:
-            print(console_out.stdout)
+            print(response)
 
-        return console_out.stdout
+        return response
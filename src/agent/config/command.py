@@ -2,10 +2,22 @@
 This Module is in charge of defining commands that are enacted by the agent
 """
 
-import json
+import errno
+import operator
 import typing
 import os
-import base64
+import shutil
+import types
+from .._base64 import b64encode
+from .._json import dumps, loads
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+_NODE_FIELDS = operator.itemgetter("xpath", "type", "id", "attributes")
+_SNAPSHOT_ROOT = os.path.join("./resources", "snapshots")
 
 
 class Node:
@@ -16,6 +28,8 @@ class Node:
     for later use, such as clicking.
     """
 
+    __slots__ = ("x_path", "type", "id", "attributes")
+
     def __init__(
         self, x_path: str, node_type: str, node_id: str, attributes: dict[str, str]
     ):
@@ -44,12 +58,8 @@ class Node:
                 f"only nodes of type element have tags. this node is of type {self.type}"
             )
 
-        tail = os.path.split(self.x_path)[-1]
-
-        if "[" in tail:
-            tail = tail.split("[")[0]
-
-        return tail
+        # xpath steps are always separated by "/", and a step may end in a predicate
+        return self.x_path.rpartition("/")[2].partition("[")[0]
 
     @classmethod
     def from_json(cls, data_dict: dict[str, typing.Any]):
@@ -58,12 +68,7 @@ class Node:
         :param data_dict: A dictionary representing the json content of the node
         :return:  object representing the json
         """
-        return cls(
-            data_dict["xpath"],
-            data_dict["type"],
-            data_dict["id"],
-            data_dict["attributes"],
-        )
+        return cls(*_NODE_FIELDS(data_dict))
 
 
 class Command:
@@ -71,34 +76,104 @@ class Command:
     The base class for agent commands
     """
 
+    __slots__ = ("command_type", "command_name", "_params")
+
     def __init__(
-        self, command_type: str, command_name: str, params: dict[str, typing.Any]
+        self,
+        command_type: str,
+        command_name: str,
+        params: dict[str, typing.Any] | None = None,
     ):
         """
         Initializes a parent command
         :param command_type: what does the agent request interaction with
         current options are llm and browser
         :param command_name: the name of the code
-        :param params: the dictionary content of the param useful for conversion
+        :param params: the dictionary content of the param useful for conversion,
+        left unset by commands that build their params from their own attributes
         """
 
         self.command_type = command_type
         self.command_name = command_name
-        self.params = params
+        self._params = params
+
+    @property
+    def params(self) -> typing.Mapping[str, typing.Any] | None:
+        """
+        The properties of the command. Commands that build their params from
+        their own attributes return a read only view of them, set the
+        attributes or assign a new dictionary to change them
+
+        :return: the params of the command as a dictionary
+        """
+        params = self._params_dict()
+        if params is self._params:
+            return params
+
+        return types.MappingProxyType(params)
+
+    @params.setter
+    def params(self, params: dict[str, typing.Any] | None):
+        """
+        Replaces the properties of the command
+
+        :param params: the params of the command as a dictionary
+        """
+        self._params = params
+
+    @classmethod
+    def init_from_dict(cls, command_dict: dict[str, typing.Any]):
+        """
+        loads the command from a dictionary, every concrete command class
+        overrides this
+
+        :param command_dict: the dictionary representation of the command
+        :return: an object of the command class this is called on
+        """
+        raise TypeError(
+            f"{cls.__name__} is not a concrete command and cannot be loaded, "
+            f"use one of its subclasses or load_command"
+        )
+
+    @classmethod
+    def init_from_json_string(cls, command: str | bytes):
+        """
+        loads the command from a json string
+
+        :param command: the string representation of the command
+        :return: an object of the command class this is called on
+        """
+        return cls.init_from_dict(loads(command))
+
+    def _params_dict(self) -> dict[str, typing.Any] | None:
+        """
+        builds the params that are serialized, commands that build their params
+        from their own attributes override this
+
+        :return: the params of the command as a dictionary
+        """
+        return self._params
 
     def to_dict(self) -> dict:
         """
         converts the command to a dictionary useful for conversion
         :return: the command as a dictionary
         """
-        return {"command_name": self.command_name, "params": self.params}
+        return {"command_name": self.command_name, "params": self._params_dict()}
+
+    def to_json_bytes(self) -> bytes:
+        """
+        returns the dictionary as utf-8 encoded json, for writing to files and pipes
+        :return: the command as bytes
+        """
+        return dumps(self.to_dict())
 
     def to_json_string(self):
         """
         returns the dictionary as a json string
         :return: the command as a string
         """
-        return json.dumps(self.to_dict())
+        return self.to_json_bytes().decode("utf-8")
 
 
 # LLM Commands
@@ -109,7 +184,9 @@ class LLMCommand(Command):
     Commands for LLM operations
     """
 
-    def __init__(self, message_type: str, message: dict[str, typing.Any]):
+    __slots__ = ("message_type",)
+
+    def __init__(self, message_type: str, message: dict[str, typing.Any] | None = None):
         """
         Initializes and LLM command
         :param message_type: type of llm messages
@@ -119,14 +196,57 @@ class LLMCommand(Command):
         self.message_type = message_type
 
     def to_dict(self) -> dict:
-        return {"message_type": self.message_type, "message": self.params}
+        return {"message_type": self.message_type, "message": self._params_dict()}
+
+
+class Message(LLMCommand):
+    """
+    An LLM command made of a role and its content. The message is built from
+    the role and content when it is requested, so no params dictionary is kept
+    alongside them
+    """
+
+    __slots__ = ("role", "content")
+
+    def __init__(self, message_type: str, role: str, content: typing.Any):
+        """
+        Initializes a role and content LLM command
+
+        :param message_type: type of llm messages
+        :param role: The role of the speaker
+        :param content: The content of the message
+        """
+        self.role = role
+        self.content = content
+        super().__init__(message_type)
+
+    def _params_dict(self) -> dict[str, typing.Any]:
+        """
+        builds the message of the command from its role and content
+
+        :return: the role and content of the command as a dictionary
+        """
+        return {"role": self.role, "content": self.content}
+
+    def _set_params(self, params: dict[str, typing.Any]):
+        """
+        Sets the role and content of the command from a message dictionary
+
+        :param params: the message of the command as a dictionary
+        """
+        self.role = params["role"]
+        self.content = params["content"]
+
+    params = property(Command.params.fget, _set_params)
 
 
-class Standard(LLMCommand):
+class Standard(Message):
     """
     A Standard LLM command, only text input
     """
 
+    __slots__ = ()
+
     def __init__(self, role: str, content: str):
         """
         Initialize a Standard LLM command with optional parameters
@@ -134,9 +254,7 @@ class Standard(LLMCommand):
         :param role: The role of the speaker (user).
         :param content: The content of the message
         """
-        self.role = role
-        self.content = content
-        super().__init__("standard", {"role": self.role, "content": self.content})
+        super().__init__("standard", role, content)
 
     @classmethod
     def init_from_dict(cls, command_dict: dict[str, typing.Any]):
@@ -165,23 +283,20 @@ class Standard(LLMCommand):
         self.content = content
 
 
-class Multimodal(LLMCommand):
+class Multimodal(Message):
     """
     A Multimodal LLM command can take input of a text and image type
     """
 
+    __slots__ = ()
+
     def __init__(self, role: str):
         """
         Initialize a Multimodal LLM command
 
         :param role: generally will be user
         """
-        self.content = []
-        self.role = role
-        super().__init__(
-            "multimodal",
-            {"role": self.role, "content": self.content},
-        )
+        super().__init__("multimodal", role, [])
 
     @classmethod
     def init_from_dict(cls, command_dict: dict[str, typing.Any]):
@@ -191,14 +306,24 @@ class Multimodal(LLMCommand):
         :param command_dict: the dictionary representation of the command
         :return: a Multimodal LLM command object
         """
+        contents = command_dict["message"]["content"]
+        if not {content["type"] for content in contents} <= {"text", "image_url"}:
+            raise ValueError(
+                "Invalid content type. Type must be 'text' or 'image_url'."
+            )
+
         multimodal_content = cls(command_dict["message"]["role"])
-        for content in command_dict["message"]["content"]:
-            if content["type"] == "text":
-                multimodal_content.add_content(content["type"], content["text"])
-            else:
-                multimodal_content.add_content(
-                    content["type"], content["image_url"]["url"]
-                )
+        multimodal_content.content.extend(
+            (
+                {"type": "text", "text": content["text"]}
+                if content["type"] == "text"
+                else {
+                    "type": "image_url",
+                    "image_url": {"url": content["image_url"]["url"]},
+                }
+            )
+            for content in contents
+        )
         return multimodal_content
 
     def set_role(self, role: str):
@@ -223,9 +348,24 @@ class Multimodal(LLMCommand):
             content_item["text"] = content
         elif ctype == "image_url":
             if b64:
+                # only needed for local images, so kept off the module import path
+                # pylint: disable=import-outside-toplevel
+                import mimetypes
+                import mmap
+
+                mime_type = mimetypes.guess_type(content)[0]
+                if not mime_type or not mime_type.startswith("image/"):
+                    mime_type = "image/jpeg"
+
                 with open(content, "rb") as image_file:
-                    encoded = base64.b64encode(image_file.read()).decode("utf-8")
-                content = f"data:image/{encoded};base64,{encoded}"
+                    encoded = ""
+                    # mmap cannot map an empty file
+                    if os.fstat(image_file.fileno()).st_size:
+                        with mmap.mmap(
+                            image_file.fileno(), 0, access=mmap.ACCESS_READ
+                        ) as image:
+                            encoded = b64encode(image)
+                content = f"data:{mime_type};base64,{encoded}"
             content_item["image_url"] = {"url": content}
         else:
             raise ValueError(
@@ -235,11 +375,13 @@ class Multimodal(LLMCommand):
         self.content.append(content_item)
 
 
-class Assistant(LLMCommand):
+class Assistant(Message):
     """
     An Assistant LLM command, which represents an assistant response in a conversation with a user.
     """
 
+    __slots__ = ()
+
     def __init__(self, role: str, content: str):
         """
         Initialize an Assistant LLM command
@@ -247,9 +389,7 @@ class Assistant(LLMCommand):
         :param role: Assistant
         :param content: The content of the message
         """
-        self.role = role
-        self.content = content
-        super().__init__("assistant", {"role": self.role, "content": self.content})
+        super().__init__("assistant", role, content)
 
     @classmethod
     def init_from_dict(cls, command_dict: dict[str, typing.Any]):
@@ -268,6 +408,8 @@ class Tool(LLMCommand):
     A Tool LLM command
     """
 
+    __slots__ = ()
+
     def __init__(self, message: dict[str, typing.Any]):
         """
         Initialize a Tool LLM command
@@ -295,12 +437,15 @@ class BrowserCommand(Command):
     Commands for browser operations
     """
 
-    def __init__(self, command_name: str, params: dict[str, typing.Any]):
+    __slots__ = ()
+
+    def __init__(self, command_name: str, params: dict[str, typing.Any] | None = None):
         """
         Initializes a browser command
 
         :param command_name: The name of the browser commands
-        :param params: the properties of the command as a dictionary
+        :param params: the properties of the command as a dictionary, left unset by
+        commands that build their params from their own attributes
         """
 
         super().__init__("browser", command_name, params)
@@ -311,6 +456,8 @@ class Navigate(BrowserCommand):
     A command that navigates to the url present
     """
 
+    __slots__ = ("url",)
+
     def __init__(self, url: str):
         """
         Initializes the navigate command
@@ -320,28 +467,35 @@ class Navigate(BrowserCommand):
         """
 
         self.url = url
-        super().__init__("open_web_page", {"url": self.url})
+        super().__init__("open_web_page")
 
-    @classmethod
-    def init_from_dict(cls, command_dict: dict[str, typing.Any]):
+    def _params_dict(self) -> dict[str, typing.Any]:
         """
-        loads the navigate command from a python dictionary
+        builds the properties of the command from its attributes
 
-        :param command_dict: the dictionary representation of the command
-        :return: a Navigate object
+        :return: the url as a dictionary
         """
-        return cls(command_dict["params"]["url"])
+        return {"url": self.url}
+
+    def _set_params(self, params: dict[str, typing.Any]):
+        """
+        Sets the url of the command from a params dictionary
+
+        :param params: the properties of the command as a dictionary
+        """
+        self.url = params["url"]
+
+    params = property(Command.params.fget, _set_params)
 
     @classmethod
-    def init_from_json_string(cls, command: str):
+    def init_from_dict(cls, command_dict: dict[str, typing.Any]):
         """
-        loads the navigate command from a json string
+        loads the navigate command from a python dictionary
 
-        :param command: the string representation of the command
+        :param command_dict: the dictionary representation of the command
         :return: a Navigate object
         """
-        command_dict = json.loads(command)
-        return Navigate.init_from_dict(command_dict)
+        return cls(command_dict["params"]["url"])
 
 
 class BrowserFile(BrowserCommand):
@@ -349,14 +503,21 @@ class BrowserFile(BrowserCommand):
     A Browser command that saves a file
     """
 
+    __slots__ = ("file_name", "snap_shot_name")
+
     def __init__(
-        self, command_name: str, params: dict, file_name: str, snap_shot_name: str
+        self,
+        command_name: str,
+        params: dict | None,
+        file_name: str,
+        snap_shot_name: str,
     ):
         """
         Initializes a browser file command
 
         :param command_name: The name of the command
-        :param params: the properties of the command as a dictionary
+        :param params: the properties of the command as a dictionary, or None for
+        commands that build their params from their own attributes
         :param file_name: the name of the file being written to
         :param snap_shot_name: the name of the snapshot folder to save
         the data too
@@ -364,7 +525,8 @@ class BrowserFile(BrowserCommand):
         self.file_name = file_name
         self.snap_shot_name = snap_shot_name
 
-        params["snap_shot_name"] = snap_shot_name
+        if params is not None:
+            params["snap_shot_name"] = snap_shot_name
 
         super().__init__(command_name, params)
 
@@ -375,9 +537,7 @@ class BrowserFile(BrowserCommand):
 
         :return: The saved file path
         """
-        return os.path.join(
-            "./resources", "snapshots", self.snap_shot_name, self.file_name
-        )
+        return os.path.join(_SNAPSHOT_ROOT, self.snap_shot_name, self.file_name)
 
     @property
     def exists(self) -> bool:
@@ -394,6 +554,8 @@ class FullPageScreenshot(BrowserFile):
     A command that takes a screenshot of the entire page
     """
 
+    __slots__ = ("quality",)
+
     def __init__(self, quality: int, name: str, snap_shot_name: str):
         """
         Initializes a FullPageScreenshot command
@@ -404,18 +566,34 @@ class FullPageScreenshot(BrowserFile):
         :param snap_shot_name: what snapshot folder to save too
         """
 
-        super().__init__(
-            "full_page_screenshot",
-            {
-                "quality": quality,
-                "name": name,
-            },
-            name,
-            snap_shot_name,
-        )
+        super().__init__("full_page_screenshot", None, name, snap_shot_name)
 
         self.quality = quality
 
+    def _params_dict(self) -> dict[str, typing.Any]:
+        """
+        builds the properties of the command from its attributes
+
+        :return: the quality, file name and snapshot folder as a dictionary
+        """
+        return {
+            "quality": self.quality,
+            "name": self.file_name,
+            "snap_shot_name": self.snap_shot_name,
+        }
+
+    def _set_params(self, params: dict[str, typing.Any]):
+        """
+        Sets the quality, file name and snapshot folder of the command from a params dictionary
+
+        :param params: the properties of the command as a dictionary
+        """
+        self.quality = params["quality"]
+        self.file_name = params["name"]
+        self.snap_shot_name = params["snap_shot_name"]
+
+    params = property(Command.params.fget, _set_params)
+
     @classmethod
     def init_from_dict(cls, command_dict: dict[str, typing.Any]):
         """
@@ -431,17 +609,6 @@ class FullPageScreenshot(BrowserFile):
             command_dict["params"]["snap_shot_name"],
         )
 
-    @classmethod
-    def init_from_json_string(cls, command: str):
-        """
-        loads the FullPageScreenshot command from a json string
-
-        :param command: the string representation of the command
-        :return: a FullPageScreenshot object
-        """
-        command_dict = json.loads(command)
-        return FullPageScreenshot.init_from_dict(command_dict)
-
     @property
     def file_path(self) -> str:
         """
@@ -451,7 +618,7 @@ class FullPageScreenshot(BrowserFile):
         """
 
         return os.path.join(
-            "./resources", "snapshots", self.snap_shot_name, "images", self.file_name
+            _SNAPSHOT_ROOT, self.snap_shot_name, "images", self.file_name
         )
 
 
@@ -460,6 +627,8 @@ class ElementScreenShot(BrowserFile):
     A command that takes a screenshot of a particular element
     """
 
+    __slots__ = ("scale", "selector")
+
     def __init__(self, scale: int, selector: str, name: str, snap_shot_name: str):
         """
         Initializes a ElementScreenShot command
@@ -469,19 +638,37 @@ class ElementScreenShot(BrowserFile):
         :param name: the name of the image file that will be written in
         :param snap_shot_name: the snapshot folder to save the image too
         """
-        super().__init__(
-            "element_screenshot",
-            {
-                "scale": scale,
-                "name": name,
-                "selector": selector,
-                "snap_shot_name": snap_shot_name,
-            },
-            name,
-            snap_shot_name,
-        )
+        super().__init__("element_screenshot", None, name, snap_shot_name)
 
         self.scale = scale
+        self.selector = selector
+
+    def _params_dict(self) -> dict[str, typing.Any]:
+        """
+        builds the properties of the command from its attributes
+
+        :return: the scale, file name, selector and snapshot folder as a dictionary
+        """
+        return {
+            "scale": self.scale,
+            "name": self.file_name,
+            "selector": self.selector,
+            "snap_shot_name": self.snap_shot_name,
+        }
+
+    def _set_params(self, params: dict[str, typing.Any]):
+        """
+        Sets the scale, file name, selector and snapshot folder of the command
+        from a params dictionary
+
+        :param params: the properties of the command as a dictionary
+        """
+        self.scale = params["scale"]
+        self.file_name = params["name"]
+        self.selector = params["selector"]
+        self.snap_shot_name = params["snap_shot_name"]
+
+    params = property(Command.params.fget, _set_params)
 
     @classmethod
     def init_from_dict(cls, command_dict: dict[str, typing.Any]):
@@ -498,17 +685,6 @@ class ElementScreenShot(BrowserFile):
             command_dict["params"]["snap_shot_name"],
         )
 
-    @classmethod
-    def init_from_json_string(cls, command: str):
-        """
-        loads the ElementScreenShot command from a json string
-
-        :param command: the string representation of the command
-        :return: a ElementScreenShot object
-        """
-        command_dict = json.loads(command)
-        return ElementScreenShot.init_from_dict(command_dict)
-
     @property
     def file_path(self) -> str:
         """
@@ -517,7 +693,7 @@ class ElementScreenShot(BrowserFile):
         :return: The saved file path
         """
         return os.path.join(
-            "./resources", "snapshots", self.snap_shot_name, "images", self.file_name
+            _SNAPSHOT_ROOT, self.snap_shot_name, "images", self.file_name
         )
 
 
@@ -526,6 +702,8 @@ class CollectNodes(BrowserFile):
     This Command collects element nodes from a webpage
     """
 
+    __slots__ = ("wait_ready", "selector")
+
     def __init__(self, selector: str, snap_shot_name: str, wait_ready=False):
         """
         Initializes a CollectNodes command
@@ -534,20 +712,35 @@ class CollectNodes(BrowserFile):
         :param snap_shot_name: the folder to write the data to
         :param wait_ready: whether to wait for the element to appear
         """
-        super().__init__(
-            "collect_nodes",
-            {
-                "wait_ready": wait_ready,
-                "selector": selector,
-                "snap_shot_name": snap_shot_name,
-            },
-            "nodeData.json",
-            snap_shot_name,
-        )
+        super().__init__("collect_nodes", None, "nodeData.json", snap_shot_name)
 
         self.wait_ready = wait_ready
         self.selector = selector
 
+    def _params_dict(self) -> dict[str, typing.Any]:
+        """
+        builds the properties of the command from its attributes
+
+        :return: the wait flag, selector and snapshot folder as a dictionary
+        """
+        return {
+            "wait_ready": self.wait_ready,
+            "selector": self.selector,
+            "snap_shot_name": self.snap_shot_name,
+        }
+
+    def _set_params(self, params: dict[str, typing.Any]):
+        """
+        Sets the wait flag, selector and snapshot folder of the command from a params dictionary
+
+        :param params: the properties of the command as a dictionary
+        """
+        self.wait_ready = params["wait_ready"]
+        self.selector = params["selector"]
+        self.snap_shot_name = params["snap_shot_name"]
+
+    params = property(Command.params.fget, _set_params)
+
     @classmethod
     def init_from_dict(cls, command_dict: dict[str, typing.Any]):
         """
@@ -562,37 +755,35 @@ class CollectNodes(BrowserFile):
             command_dict["params"]["wait_ready"],
         )
 
-    @classmethod
-    def init_from_json_string(cls, command: str):
+    def iter_nodes(self, node_path: str | None = None) -> typing.Iterator[Node]:
         """
-        Loads the CollectNodes command from a json string
-
-        :param command: The string representation of the command
-        :return: a CollectNodes object
-        """
-        command_dict = json.loads(command)
-        return CollectNodes.init_from_dict(command_dict)
-
-    def load_json(self, node_path: str | None = None) -> list[Node]:
-        """
-        Loads the collected file and return a list of nodes
+        Lazily loads the collected file, yielding one node at a time. When ijson
+        is installed the file is stream parsed, so the whole node dump is never
+        held in memory
 
         :param node_path: The path to the node files
-        :return: a list of nodes
+        :return: an iterator over the nodes
         """
         if not self.exists:
             raise FileNotFoundError("node json file does not exist")
 
         node_path = node_path if node_path else self.file_path
 
-        with open(node_path, "r", encoding="utf-8") as file:
-            node_json_data = json.load(file)
+        with open(node_path, "rb") as file:
+            if ijson is None:
+                yield from map(Node.from_json, loads(file.read()))
+                return
 
-        node_list = []
-        for node in node_json_data:
-            node_list.append(Node.from_json(node))
+            yield from map(Node.from_json, ijson.items(file, "item", use_float=True))
+
+    def load_json(self, node_path: str | None = None) -> list[Node]:
+        """
+        Loads the collected file and return a list of nodes
 
-        return node_list
+        :param node_path: The path to the node files
+        :return: a list of nodes
+        """
+        return list(self.iter_nodes(node_path))
 
 
 class SaveHtml(BrowserFile):
@@ -600,36 +791,43 @@ class SaveHtml(BrowserFile):
     Saves HTML to a file
     """
 
+    __slots__ = ()
+
     def __init__(self, snap_shot_name: str):
         """
         Initializes a CollectNodes command
 
         :param snap_shot_name: The snapshot to save the html too
         """
-        super().__init__(
-            "save_html", {"snap_shot_name": snap_shot_name}, "body.txt", snap_shot_name
-        )
+        super().__init__("save_html", None, "body.txt", snap_shot_name)
 
-    @classmethod
-    def init_from_dict(cls, command_dict: dict[str, typing.Any]):
+    def _params_dict(self) -> dict[str, typing.Any]:
         """
-        loads the SaveHtml command from a python dictionary
+        builds the properties of the command from its attributes
 
-        :param command_dict: the dictionary representation of the command
-        :return: a SaveHtml object
+        :return: the snapshot folder as a dictionary
         """
-        return cls(command_dict["params"]["snap_shot_name"])
+        return {"snap_shot_name": self.snap_shot_name}
+
+    def _set_params(self, params: dict[str, typing.Any]):
+        """
+        Sets the snapshot folder of the command from a params dictionary
+
+        :param params: the properties of the command as a dictionary
+        """
+        self.snap_shot_name = params["snap_shot_name"]
+
+    params = property(Command.params.fget, _set_params)
 
     @classmethod
-    def init_from_json_string(cls, command: str):
+    def init_from_dict(cls, command_dict: dict[str, typing.Any]):
         """
-        Loads the SaveHtml command from a json string
+        loads the SaveHtml command from a python dictionary
 
-        :param command: The string representation of command
+        :param command_dict: the dictionary representation of the command
         :return: a SaveHtml object
         """
-        command_dict = json.loads(command)
-        return SaveHtml.init_from_dict(command_dict)
+        return cls(command_dict["params"]["snap_shot_name"])
 
 
 class Sleep(BrowserCommand):
@@ -637,36 +835,45 @@ class Sleep(BrowserCommand):
     A command that instructs the browser to sleep for a duration
     """
 
+    __slots__ = ("seconds",)
+
     def __init__(self, seconds: int):
         """
         Initializes a Sleep command
 
         :param seconds: The sleep duration
         """
-        super().__init__("sleep", {"seconds": seconds})
+        super().__init__("sleep")
 
         self.seconds = seconds
 
-    @classmethod
-    def init_from_dict(cls, command_dict: dict[str, typing.Any]):
+    def _params_dict(self) -> dict[str, typing.Any]:
         """
-        loads the Sleep command from a python dictionary
+        builds the properties of the command from its attributes
 
-        :param command_dict: the dictionary representation of the command
-        :return: a Sleep object
+        :return: the sleep duration as a dictionary
         """
-        return cls(command_dict["params"]["seconds"])
+        return {"seconds": self.seconds}
+
+    def _set_params(self, params: dict[str, typing.Any]):
+        """
+        Sets the sleep duration of the command from a params dictionary
+
+        :param params: the properties of the command as a dictionary
+        """
+        self.seconds = params["seconds"]
+
+    params = property(Command.params.fget, _set_params)
 
     @classmethod
-    def init_from_json_string(cls, command: str):
+    def init_from_dict(cls, command_dict: dict[str, typing.Any]):
         """
-        loads the Sleep command from a json string
+        loads the Sleep command from a python dictionary
 
-        :param command: the string representation of the command
+        :param command_dict: the dictionary representation of the command
         :return: a Sleep object
         """
-        command_dict = json.loads(command)
-        return Sleep.init_from_dict(command_dict)
+        return cls(command_dict["params"]["seconds"])
 
 
 class Click(BrowserCommand):
@@ -674,6 +881,8 @@ class Click(BrowserCommand):
     A Command that clicks on a portion of the loaded website
     """
 
+    __slots__ = ("selector", "query_type")
+
     def __init__(self, selector: str, query_type: str):
         """
         Initializes a click command
@@ -681,10 +890,29 @@ class Click(BrowserCommand):
         :param selector: The value you are using to discriminate your selection
         :param query_type: the type of the selector ex: x_path
         """
-        super().__init__("click", {"selector": selector, "query_type": query_type})
+        super().__init__("click")
         self.selector = selector
         self.query_type = query_type
 
+    def _params_dict(self) -> dict[str, typing.Any]:
+        """
+        builds the properties of the command from its attributes
+
+        :return: the selector and query type as a dictionary
+        """
+        return {"selector": self.selector, "query_type": self.query_type}
+
+    def _set_params(self, params: dict[str, typing.Any]):
+        """
+        Sets the selector and query type of the command from a params dictionary
+
+        :param params: the properties of the command as a dictionary
+        """
+        self.selector = params["selector"]
+        self.query_type = params["query_type"]
+
+    params = property(Command.params.fget, _set_params)
+
     @classmethod
     def init_from_dict(cls, command_dict: dict[str, typing.Any]):
         """
@@ -697,28 +925,68 @@ class Click(BrowserCommand):
             command_dict["params"]["selector"], command_dict["params"]["query_type"]
         )
 
-    @classmethod
-    def init_from_json_string(cls, command: str):
-        """
-        Loads the Click command from a json string
 
-        :param command: The string representation of the command
-        :return: a Click object
-        """
-        command_dict = json.loads(command)
-        return Click.init_from_dict(command_dict)
+BROWSER_COMMANDS: dict[str, type[BrowserCommand]] = {
+    "open_web_page": Navigate,
+    "full_page_screenshot": FullPageScreenshot,
+    "element_screenshot": ElementScreenShot,
+    "collect_nodes": CollectNodes,
+    "save_html": SaveHtml,
+    "sleep": Sleep,
+    "click": Click,
+}
+
+LLM_COMMANDS: dict[str, type[LLMCommand]] = {
+    "standard": Standard,
+    "multimodal": Multimodal,
+    "assistant": Assistant,
+    "tool": Tool,
+}
+
+
+def load_command(command: str | bytes | dict[str, typing.Any]) -> Command:
+    """
+    Loads any command from its json string or dictionary. LLM commands are
+    identified by their message type and browser commands by their command name
+
+    :param command: the json string or dictionary representation of the command
+    :return: an object of the matching command class
+    """
+    command_dict = loads(command) if isinstance(command, (str, bytes)) else command
+
+    if "message_type" in command_dict:
+        command_class = LLM_COMMANDS.get(command_dict["message_type"])
+        command_key = command_dict["message_type"]
+    else:
+        command_class = BROWSER_COMMANDS.get(command_dict["command_name"])
+        command_key = command_dict["command_name"]
 
+    if command_class is None:
+        raise TypeError(f"{command_key} is not a valid command")
 
-def move_file(command: BrowserFile, new_path):
+    return command_class.init_from_dict(command_dict)
+
+
+def move_file(command: BrowserFile, new_path, copy=False):
     """
     Helper function that moves files to different areas
 
     :param command: The command containing a file
     :param new_path: the path to where the file should be written
+    :param copy: whether to leave the original file in place
     """
     f_name = os.path.split(command.file_path)[-1]
-    with open(command.file_path, "rb") as file:
-        f_bytes = file.read()
-
-    with open(os.path.join(new_path, f_name), "wb") as file2:
-        file2.write(f_bytes)
+    destination = os.path.join(new_path, f_name)
+
+    if copy:
+        shutil.copyfile(command.file_path, destination)
+        return
+
+    try:
+        os.replace(command.file_path, destination)
+    except OSError as error:
+        # renames cannot cross filesystems, so the file is copied and removed
+        if error.errno != errno.EXDEV:
+            raise
+        shutil.copyfile(command.file_path, destination)
+        os.remove(command.file_path)
@@ -2,23 +2,10 @@
 This module handles processing operations which are sequences of commands
 """
 
-import json
 import typing
 from typing import Union
-from .command import (
-    Command,
-    Navigate,
-    FullPageScreenshot,
-    ElementScreenShot,
-    CollectNodes,
-    SaveHtml,
-    Sleep,
-    Click,
-    Standard,
-    Multimodal,
-    Assistant,
-    Tool,
-)
+from .._json import dumps
+from .command import Command, BROWSER_COMMANDS, LLM_COMMANDS
 
 
 class Operation(list):
@@ -26,6 +13,8 @@ class Operation(list):
     Am Operation is a list of commands
     """
 
+    __slots__ = ("op_type", "timeout")
+
     def __init__(
         self,
         op_type: str,
@@ -79,13 +68,21 @@ class Operation(list):
 
         return op_dict
 
+    def to_json_bytes(self) -> bytes:
+        """
+        converts the operation to utf-8 encoded json, for writing to files and pipes
+
+        :return: an operation as bytes
+        """
+        return dumps(self.to_dict())
+
     def to_json_string(self) -> str:
         """
         converts the operation to a json string
 
         :return: an operation string
         """
-        return json.dumps(self.to_dict())
+        return self.to_json_bytes().decode("utf-8")
 
 
 class BrowserOperations(Operation):
@@ -93,6 +90,8 @@ class BrowserOperations(Operation):
     An operation that holds and processes browser commands
     """
 
+    __slots__ = ("headless",)
+
     def __init__(self, headless: bool = False, timeout: None | int = None):
         """
         Initializes a Browser Operation
@@ -124,27 +123,13 @@ class BrowserOperations(Operation):
         browser_opts = cls(**data_dict["settings"])
 
         for command in data_dict["command_list"]:
+            command_class = BROWSER_COMMANDS.get(command["command_name"])
+            if command_class is None:
+                raise TypeError(
+                    f"{command['command_name']} is not a valid browser command"
+                )
 
-            match command["command_name"]:
-                case "open_web_page":
-                    initialized_command = Navigate.init_from_dict(command)
-                case "full_page_screenshot":
-                    initialized_command = FullPageScreenshot.init_from_dict(command)
-                case "element_screenshot":
-                    initialized_command = ElementScreenShot.init_from_dict(command)
-                case "collect_nodes":
-                    initialized_command = CollectNodes.init_from_dict(command)
-                case "save_html":
-                    initialized_command = SaveHtml.init_from_dict(command)
-                case "sleep":
-                    initialized_command = Sleep.init_from_dict(command)
-                case "click":
-                    initialized_command = Click.init_from_dict(command)
-                case _:
-                    raise TypeError(
-                        f"{command['command_name']} is not a valid browser command"
-                    )
-
+            initialized_command = command_class.init_from_dict(command)
             browser_opts.append(initialized_command)
 
         return browser_opts
@@ -155,6 +140,8 @@ class LLMSettings(dict):
     A dictionary subclass for the settings of an LLM.
     """
 
+    __slots__ = ()
+
     def __init__(
         self, name: Union[str, None] = None, api_key: Union[str, None] = None, **kwargs
     ):
@@ -179,6 +166,10 @@ class OpenAISettings(LLMSettings):
     A subclass of LLMSettings that is a dictionary of settings unique to OpenAi's api
     """
 
+    __slots__ = ()
+
+    _allowed_keys = frozenset({"name", "api_key", "model", "temperature"})
+
     def __init__(
         self,
         name: Union[str, None] = None,
@@ -199,7 +190,6 @@ class OpenAISettings(LLMSettings):
         if not isinstance(temperature, float):
             raise TypeError("Temperature must be a float.")
 
-        self._allowed_keys = {"name", "api_key", "model", "temperature"}
         self.update(
             {
                 "name": name,
@@ -231,6 +221,8 @@ class LLMOperations(Operation):
     Subclass of Operations specifically designed for making requests for LLM Commands.
     """
 
+    __slots__ = ("settings",)
+
     def __init__(  # pylint: disable=too-many-arguments
         self,
         try_limit: int,
@@ -288,21 +280,11 @@ class LLMOperations(Operation):
         )
 
         for command in data_dict["command_list"]:
+            command_class = LLM_COMMANDS.get(command["message_type"])
+            if command_class is None:
+                raise TypeError(f"{command['message_type']} is not a valid LLM command")
 
-            match command["message_type"]:
-                case "standard":
-                    initialized_command = Standard.init_from_dict(command)
-                case "multimodal":
-                    initialized_command = Multimodal.init_from_dict(command)
-                case "assistant":
-                    initialized_command = Assistant.init_from_dict(command)
-                case "tool":
-                    initialized_command = Tool.init_from_dict(command)
-                case _:
-                    raise TypeError(
-                        f"{command['command_name']} is not a valid LLM command"
-                    )
-
+            initialized_command = command_class.init_from_dict(command)
             llm_opts.append(initialized_command)
 
         return llm_opts
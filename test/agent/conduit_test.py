@@ -0,0 +1,430 @@
+"""
+Tests for conduit.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import pytest
+from agent import conduit as conduit_module
+from agent.conduit import Conduit, load_config, iter_config, _executable
+from agent.config.operation import BrowserOperations, LLMOperations
+from agent.config.command import Navigate
+
+browser_operation_data = {
+    "type": "browser",
+    "settings": {"headless": True},
+    "command_list": [
+        {"command_name": "open_web_page", "params": {"url": "https://example.com"}},
+        {"command_name": "sleep", "params": {"seconds": 1}},
+    ],
+}
+
+llm_operation_data = {
+    "type": "llm",
+    "settings": {
+        "try_limit": 3,
+        "timeout": 30,
+        "max_tokens": 300,
+        "llm_settings": [{"name": "OpenAI", "api_key": "someKey"}],
+        "workflow": {"workflow_type": "chat_completion"},
+    },
+    "command_list": [
+        {
+            "message_type": "standard",
+            "message": {"role": "user", "content": "Hello."},
+        }
+    ],
+}
+
+
+@pytest.fixture
+def fake_agent(tmpdir, monkeypatch):
+    """
+    Function that puts a stand-in agent cli on the PATH. It prints the
+    config it receives, from a path or a base64 -b argument, and a blank line
+    to stderr, and reports an error for an empty config
+    :param tmpdir: A temporary directory
+    :param monkeypatch: pytest's monkeypatch fixture
+    """
+    if os.name != "posix":
+        pytest.skip("the stand-in agent cli is a shell script")
+
+    agent_path = tmpdir.join("agent")
+    agent_path.write(
+        "#!/bin/sh\n"
+        'if [ "$2" = "-b" ]; then config=$(printf "%s" "$3" | base64 -d); '
+        'else config=$(cat "$2"); fi\n'
+        'if [ "$config" = \'{"operations":[]}\' ]; then echo "no operations" >&2; fi\n'
+        "echo >&2\n"
+        'printf "%s" "$config"\n'
+    )
+    agent_path.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmpdir}{os.pathsep}{os.environ['PATH']}")
+    _executable.cache_clear()
+    yield
+    _executable.cache_clear()
+
+
+def write_config(path, operations: list[dict]):
+    """
+    Function that writes a config file for load_config tests
+    :param path: where the config should be written
+    :param operations: the operation dictionaries of the config
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"operations": operations}, file)
+
+
+def test_load_config(tmpdir):
+    """
+    Function that tests the loading of a config file
+    :param tmpdir: A temporary directory
+    """
+    config_path = tmpdir.join("config.json")
+    write_config(config_path, [llm_operation_data, browser_operation_data])
+
+    operations = load_config(str(config_path))
+    assert len(operations) == 2
+    assert isinstance(operations[0], BrowserOperations)
+    assert isinstance(operations[1], LLMOperations)
+    assert len(operations[0]) == 2
+    assert len(operations[1]) == 1
+
+
+def test_load_config_returns_new_operations(tmpdir):
+    """
+    Function that tests that repeated loads of a file do not share operations
+    :param tmpdir: A temporary directory
+    """
+    config_path = tmpdir.join("config.json")
+    write_config(config_path, [browser_operation_data])
+
+    first = load_config(str(config_path))
+    second = load_config(str(config_path))
+    assert first[0] is not second[0]
+    assert first[0].to_dict() == second[0].to_dict()
+
+
+def test_load_config_does_not_share_params(tmpdir):
+    """
+    Function that tests that changing a loaded command does not change later loads
+    :param tmpdir: A temporary directory
+    """
+    tool_operation_data = {
+        **llm_operation_data,
+        "command_list": [{"message_type": "tool", "message": {"content": "result"}}],
+    }
+    config_path = tmpdir.join("config.json")
+    write_config(config_path, [tool_operation_data])
+
+    load_config(str(config_path))[0][0].params["content"] = "MUTATED"
+    assert load_config(str(config_path))[0][0].params == {"content": "result"}
+
+
+def test_load_config_reloads_changed_file(tmpdir):
+    """
+    Function that tests that an edited config file is read again
+    :param tmpdir: A temporary directory
+    """
+    config_path = tmpdir.join("config.json")
+    write_config(config_path, [browser_operation_data])
+    assert len(load_config(str(config_path))) == 1
+
+    write_config(config_path, [browser_operation_data, llm_operation_data])
+    assert len(load_config(str(config_path))) == 2
+
+    # a rewrite of the same size within one modification time tick
+    first = json.dumps({"operations": [browser_operation_data]})
+    config_path.write(first)
+    stat = os.stat(config_path)
+    assert load_config(str(config_path))[0][0].url == "https://example.com"
+
+    config_path.write(first.replace("example.com", "example.org"))
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert load_config(str(config_path))[0][0].url == "https://example.org"
+
+
+def test_load_config_invalid_type(tmpdir):
+    """
+    Function that tests the loading of a config with an invalid operation type
+    :param tmpdir: A temporary directory
+    """
+    config_path = tmpdir.join("config.json")
+    write_config(config_path, [{"type": "invalid", "command_list": []}])
+
+    with pytest.raises(TypeError):
+        load_config(str(config_path))
+
+
+def test_iter_config_keeps_file_order(tmpdir):
+    """
+    Function that tests that iter_config yields operations in file order
+    :param tmpdir: A temporary directory
+    """
+    config_path = tmpdir.join("config.json")
+    write_config(config_path, [llm_operation_data, browser_operation_data])
+
+    operations = list(iter_config(str(config_path)))
+    assert [op.op_type for op in operations] == ["llm", "browser"]
+    assert operations[0].get_settings()["llm_settings"][0]["name"] == "OpenAI"
+
+
+def test_iter_config_with_ijson(tmpdir):
+    """
+    Function that tests that iter_config stream parses configs with ijson
+    :param tmpdir: A temporary directory
+    """
+    pytest.importorskip("ijson")
+    assert conduit_module.ijson is not None
+
+    config_path = tmpdir.join("config.json")
+    write_config(config_path, [llm_operation_data, browser_operation_data])
+    operations = list(iter_config(str(config_path)))
+    assert [op.to_dict() for op in operations] == [
+        op.to_dict() for op in reversed(load_config(str(config_path)))
+    ]
+
+    write_config(config_path, [])
+    assert not list(iter_config(str(config_path)))
+
+
+def test_iter_config_missing_operations(tmpdir, monkeypatch):
+    """
+    Function that tests that both parsers reject a config without operations
+    :param tmpdir: A temporary directory
+    :param monkeypatch: pytest's monkeypatch fixture
+    """
+    config_path = tmpdir.join("config.json")
+    with open(config_path, "w", encoding="utf-8") as file:
+        json.dump({"settings": {}}, file)
+
+    with pytest.raises(KeyError):
+        list(iter_config(str(config_path)))
+
+    monkeypatch.setattr(conduit_module, "ijson", None)
+    with pytest.raises(KeyError):
+        list(iter_config(str(config_path)))
+
+
+def test_conduit_serialize():
+    """
+    Function that tests the serialization of a conduit's config
+    """
+    browser_op = BrowserOperations()
+    browser_op.append(Navigate("https://example.com"))
+    conduit = Conduit([browser_op])
+
+    assert json.loads(conduit.serialize()) == {"operations": [browser_op.to_dict()]}
+    assert conduit.serialize() is not conduit.serialize()
+
+    cached = Conduit([browser_op], cache=True)
+    assert json.loads(cached.serialize()) == {"operations": [browser_op.to_dict()]}
+    assert cached.serialize() is cached.serialize()
+
+
+def test_conduit_serialize_in_place_edit():
+    """
+    Function that tests that uncached conduits pick up operations modified in place
+    """
+    browser_op = BrowserOperations()
+    conduit = Conduit([browser_op])
+    conduit.serialize()
+
+    browser_op.append(Navigate("https://example.com"))
+    assert json.loads(conduit.serialize())["operations"][0]["command_list"]
+
+
+def test_conduit_serialize_invalidate():
+    """
+    Function that tests that modified configs are serialized again
+    """
+    browser_op = BrowserOperations()
+    conduit = Conduit([browser_op], cache=True)
+    first = conduit.serialize()
+
+    browser_op.append(Navigate("https://example.com"))
+    conduit.invalidate()
+    assert json.loads(conduit.serialize())["operations"][0]["command_list"]
+
+    conduit.config = []
+    assert conduit.serialize() != first
+    assert json.loads(conduit.serialize()) == {"operations": []}
+
+
+# pylint: disable= W0621, W0613
+def test_conduit_run(fake_agent):
+    """
+    Function that tests running a config through the agent cli
+    :param fake_agent: A stand-in agent cli
+    """
+    browser_op = BrowserOperations()
+    browser_op.append(Navigate("https://example.com"))
+    conduit = Conduit([browser_op])
+
+    assert json.loads(conduit.run()) == json.loads(conduit.serialize())
+
+
+def test_conduit_run_without_capture(fake_agent):
+    """
+    Function that tests running a config while discarding its output
+    :param fake_agent: A stand-in agent cli
+    """
+    browser_op = BrowserOperations()
+    browser_op.append(Navigate("https://example.com"))
+
+    assert Conduit([browser_op]).run(capture=False) == ""
+
+    with pytest.raises(EnvironmentError):
+        Conduit([]).run(capture=False)
+
+
+def test_conduit_run_error(fake_agent):
+    """
+    Function that tests that cli errors are raised
+    :param fake_agent: A stand-in agent cli
+    """
+    with pytest.raises(EnvironmentError):
+        Conduit([]).run()
+
+
+def test_conduit_run_async(fake_agent):
+    """
+    Function that tests running several configs at once
+    :param fake_agent: A stand-in agent cli
+    """
+    conduits = []
+    for url in ("https://example.com", "https://example.org"):
+        browser_op = BrowserOperations()
+        browser_op.append(Navigate(url))
+        conduits.append(Conduit([browser_op]))
+
+    processes = [conduit.run_async() for conduit in conduits]
+    outputs = Conduit.gather(processes)
+    assert [json.loads(out) for out in outputs] == [
+        json.loads(conduit.serialize()) for conduit in conduits
+    ]
+
+    with pytest.raises(EnvironmentError):
+        Conduit.gather([Conduit([]).run_async()])
+
+
+def test_conduit_run_base64_argument(fake_agent, monkeypatch):
+    """
+    Function that tests passing the config as a base64 argument
+    :param fake_agent: A stand-in agent cli
+    :param monkeypatch: pytest's monkeypatch fixture
+    """
+    monkeypatch.setattr(conduit_module, "_PIPE_CONFIG", False)
+    browser_op = BrowserOperations()
+    browser_op.append(Navigate("https://example.com"))
+    conduit = Conduit([browser_op])
+    expected = json.loads(conduit.serialize())
+
+    assert json.loads(conduit.run()) == expected
+    assert [json.loads(out) for out in Conduit.gather([conduit.run_async()])] == [
+        expected
+    ]
+
+    with pytest.raises(EnvironmentError):
+        Conduit([]).run()
+
+
+def test_conduit_run_temp_file(fake_agent, tmpdir, monkeypatch):
+    """
+    Function that tests passing configs too large for an argument in a temporary file
+    :param fake_agent: A stand-in agent cli
+    :param tmpdir: A temporary directory
+    :param monkeypatch: pytest's monkeypatch fixture
+    """
+    monkeypatch.setattr(conduit_module, "_PIPE_CONFIG", False)
+    monkeypatch.setattr(conduit_module, "_MAX_ARG_CONFIG", 0)
+    temp_dir = tmpdir.mkdir("configs")
+    monkeypatch.setattr(tempfile, "tempdir", str(temp_dir))
+    browser_op = BrowserOperations()
+    browser_op.append(Navigate("https://example.com"))
+    conduit = Conduit([browser_op])
+    expected = json.loads(conduit.serialize())
+
+    assert json.loads(conduit.run()) == expected
+    assert not temp_dir.listdir()
+
+    process = conduit.run_async()
+    assert len(temp_dir.listdir()) == 1
+    assert [json.loads(out) for out in Conduit.gather([process])] == [expected]
+    assert not temp_dir.listdir()
+
+    with pytest.raises(EnvironmentError):
+        Conduit([]).run()
+    assert not temp_dir.listdir()
+
+
+def test_conduit_run_async_missing_cli(tmpdir, monkeypatch):
+    """
+    Function that tests that failing to start the agent cli leaks no file descriptors
+    :param tmpdir: A temporary directory
+    :param monkeypatch: pytest's monkeypatch fixture
+    """
+    if not os.path.isdir("/proc/self/fd"):
+        pytest.skip("open file descriptors are listed through /proc")
+
+    monkeypatch.setenv("PATH", str(tmpdir))
+    _executable.cache_clear()
+    open_fds = len(os.listdir("/proc/self/fd"))
+    for _ in range(5):
+        with pytest.raises(FileNotFoundError):
+            Conduit([BrowserOperations()]).run_async()
+
+    _executable.cache_clear()
+    assert len(os.listdir("/proc/self/fd")) == open_fds
+
+
+def test_pipe_config_without_stdin():
+    """
+    Function that tests that the config is piped even when the importing process has no stdin
+    """
+    if os.name != "posix":
+        pytest.skip("the config is only piped on posix platforms")
+
+    result = subprocess.run(
+        [
+            "/bin/sh",
+            "-c",
+            f'"{sys.executable}" -c '
+            '"from agent.conduit import _PIPE_CONFIG; print(_PIPE_CONFIG)" <&-',
+        ],
+        capture_output=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        text=True,
+    )
+    assert result.stdout.strip() == "True"
+
+
+def test_conduit_run_async_cli_exits_early(fake_agent, tmpdir, monkeypatch):
+    """
+    Function that tests running a config through a cli that exits without reading it
+    :param fake_agent: A stand-in agent cli
+    :param tmpdir: A temporary directory
+    :param monkeypatch: pytest's monkeypatch fixture
+    """
+    agent_path = tmpdir.join("agent")
+    agent_path.write('#!/bin/sh\necho "config rejected" >&2\n')
+
+    popen = subprocess.Popen
+
+    def popen_and_wait(*args, **kwargs):
+        # the cli has exited before run_async writes the config
+        process = popen(*args, **kwargs)  # pylint: disable=consider-using-with
+        process.wait()
+        return process
+
+    monkeypatch.setattr(subprocess, "Popen", popen_and_wait)
+    browser_op = BrowserOperations()
+    browser_op.append(Navigate("https://example.com"))
+    process = Conduit([browser_op]).run_async()
+
+    with pytest.raises(EnvironmentError, match="config rejected"):
+        Conduit.gather([process])
@@ -2,7 +2,10 @@
 Tests for command.py
 """
 
+import base64
+import json
 import os
+import re
 import shutil
 import pytest
 from agent.config.command import (
@@ -11,12 +14,15 @@ from agent.config.command import (
     Standard,
     Multimodal,
     Assistant,
+    Tool,
     BrowserCommand,
     Navigate,
     BrowserFile,
     FullPageScreenshot,
     ElementScreenShot,
     CollectNodes,
+    Node,
+    load_command,
     SaveHtml,
     Sleep,
     Click,
@@ -55,10 +61,18 @@ def test_command_to_json_string():
     command = Command("llm", "test_command", {"param": "value"})
     assert (
         command.to_json_string()
-        == '{"command_name": "test_command", "params": {"param": "value"}}'
+        == '{"command_name":"test_command","params":{"param":"value"}}'
     )
 
 
+def test_command_to_json_bytes():
+    """
+    Function to test conversion of Command to json bytes
+    """
+    command = Command("llm", "test_command", {"param": "value"})
+    assert command.to_json_bytes() == command.to_json_string().encode("utf-8")
+
+
 def test_llm_command_init():
     """
     Function to test initialization of LLM Command
@@ -108,7 +122,7 @@ def test_browser_command_to_json_string():
     browser_command = BrowserCommand("test_command", {"param": "value"})
     assert (
         browser_command.to_json_string()
-        == '{"command_name": "test_command", "params": {"param": "value"}}'
+        == '{"command_name":"test_command","params":{"param":"value"}}'
     )
 
 
@@ -139,6 +153,28 @@ def test_standard_set_role():
     standard_command = Standard("", "Hello, world!")
     standard_command.set_role("user")
     assert standard_command.role == "user"
+    assert standard_command.to_dict() == {
+        "message_type": "standard",
+        "message": {"role": "user", "content": "Hello, world!"},
+    }
+
+
+def test_standard_set_params():
+    """
+    Function to test replacing the params of Standard LLM Command, and that they
+    cannot be changed in place
+    """
+    standard_command = Standard("user", "Hello")
+    standard_command.params = {"role": "system", "content": "Be brief"}
+    assert standard_command.role == "system"
+    assert standard_command.content == "Be brief"
+
+    with pytest.raises(TypeError):
+        standard_command.params["content"] = "Be verbose"
+    assert standard_command.to_dict()["message"] == {
+        "role": "system",
+        "content": "Be brief",
+    }
 
 
 def test_standard_set_content():
@@ -189,6 +225,16 @@ def test_multimodal_init_from_dict():
     )
 
 
+def test_multimodal_init_from_dict_invalid_type():
+    """
+    Function to test initialization of Multimodal LLM Command with an invalid content type
+    """
+    with pytest.raises(ValueError):
+        Multimodal.init_from_dict(
+            {"message": {"role": "user", "content": [{"type": "audio"}]}}
+        )
+
+
 def test_multimodal_set_role():
     """
     Function to test set role of Multimodal LLM Command
@@ -223,6 +269,30 @@ def test_multimodal_add_content_image_url():
     )
 
 
+def test_multimodal_add_content_image_b64(tmpdir):
+    """
+    Function to test adding a base64 encoded image to a Multimodal LLM Command
+    :param tmpdir: A temporary directory
+    """
+    image_path = tmpdir.join("image.png")
+    image_path.write_binary(b"\x89PNG\r\n\x1a\n")
+    empty_path = tmpdir.join("empty.jpg")
+    empty_path.write_binary(b"")
+
+    multimodal_command = Multimodal("user")
+    multimodal_command.add_content("image_url", str(image_path), b64=True)
+    multimodal_command.add_content("image_url", str(empty_path), b64=True)
+
+    url = multimodal_command.content[0]["image_url"]["url"]
+    assert re.match(r"^data:image/[a-z]+;base64,", url)
+    assert url == "data:image/png;base64," + base64.b64encode(
+        b"\x89PNG\r\n\x1a\n"
+    ).decode("ascii")
+    assert multimodal_command.content[1]["image_url"]["url"] == (
+        "data:image/jpeg;base64,"
+    )
+
+
 # Sample test data
 assistant_command_data = {
     "message": {"role": "assistant", "content": "Hello, how can I assist you?"}
@@ -286,6 +356,31 @@ def test_navigate_init_from_json_string():
     assert navigate_command.params == {"url": "https://example.com"}
 
 
+def test_tool_to_json_string_non_str_keys():
+    """
+    Function to test that commands with non string keys serialize with either json backend
+    """
+    tool = Tool({"choices": {0: "a"}})
+    assert json.loads(tool.to_json_string()) == {
+        "message_type": "tool",
+        "message": {"choices": {"0": "a"}},
+    }
+
+
+def test_abstract_command_init_from_json_string():
+    """
+    Function to test that commands without a concrete class cannot be loaded
+    """
+    navigate_command_json = (
+        '{"command_name": "open_web_page", "params": {"url": "https://example.com"}}'
+    )
+    with pytest.raises(TypeError, match="BrowserFile is not a concrete command"):
+        BrowserFile.init_from_json_string(navigate_command_json)
+
+    with pytest.raises(TypeError, match="Command is not a concrete command"):
+        Command.init_from_dict({"command_name": "open_web_page"})
+
+
 @pytest.fixture
 def sample_browser_file():
     """
@@ -583,6 +678,57 @@ def test_collect_nodes_init_from_json_string():
     assert collect_nodes.snap_shot_name == "snapshot"
 
 
+def test_collect_nodes_load_json(tmpdir):
+    """
+    Function to test loading the nodes collected by a Collect Nodes object
+    :param tmpdir: A temporary directory
+    """
+    collect_nodes = CollectNodes("div", str(tmpdir))
+    with open(tmpdir.join("nodeData.json"), "w", encoding="utf-8") as f:
+        f.write(
+            '[{"xpath": "/html/body/div[1]", "type": "element", "id": "1", '
+            '"attributes": {"class": "container"}}, '
+            '{"xpath": "/html/body/p", "type": "text", "id": "2", "attributes": {}}]'
+        )
+
+    nodes = collect_nodes.load_json()
+    assert [node.id for node in nodes] == ["1", "2"]
+    assert nodes[0].x_path == "/html/body/div[1]"
+    assert nodes[0].attributes == {"class": "container"}
+    assert [node.id for node in collect_nodes.iter_nodes()] == ["1", "2"]
+
+
+def test_collect_nodes_iter_nodes_with_ijson(tmpdir):
+    """
+    Function to test stream parsing the collected nodes with ijson
+    :param tmpdir: A temporary directory
+    """
+    pytest.importorskip("ijson")
+    collect_nodes = CollectNodes("div", str(tmpdir))
+    with open(tmpdir.join("nodeData.json"), "w", encoding="utf-8") as f:
+        f.write(
+            '[{"xpath": "/html/body/div[1]", "type": "element", "id": "1", '
+            '"attributes": {"class": "container", "opacity": 0.5}}, '
+            '{"xpath": "/html/body/p", "type": "text", "id": "2", "attributes": {}}]'
+        )
+
+    nodes = list(collect_nodes.iter_nodes())
+    assert [node.id for node in nodes] == ["1", "2"]
+    assert nodes[0].attributes == {"class": "container", "opacity": 0.5}
+    assert isinstance(nodes[0].attributes["opacity"], float)
+    assert [node.id for node in collect_nodes.load_json()] == ["1", "2"]
+
+
+def test_node_tag():
+    """
+    Function to test the tag name of a Node
+    """
+    assert Node("/html/body/div[1]", "Element", "1", {}).tag == "div"
+    assert Node("/html/body/p", "Element", "2", {}).tag == "p"
+    with pytest.raises(TypeError):
+        _ = Node("/html/body/p/text()", "Text", "3", {}).tag
+
+
 @pytest.fixture
 def sample_save_html():
     """
@@ -672,6 +818,44 @@ def test_sleep_init_from_json_string():
     assert sleep.seconds == 5
 
 
+def test_sleep_params_follow_attributes():
+    """
+    Function to test that a Sleep object's params reflect its current attributes
+    """
+    sleep = Sleep(5)
+    sleep.seconds = 10
+    assert sleep.to_dict() == {"command_name": "sleep", "params": {"seconds": 10}}
+
+
+def test_sleep_set_params():
+    """
+    Function to test replacing the params of a Sleep object
+    """
+    sleep = Sleep(5)
+    sleep.params = {"seconds": 10}
+    assert sleep.seconds == 10
+    assert sleep.params == {"seconds": 10}
+
+
+def test_browser_command_params_read_only():
+    """
+    Function to test that the params built from a command's attributes cannot be changed in place
+    """
+    navigate = Navigate("https://example.com")
+    with pytest.raises(TypeError):
+        navigate.params["url"] = "https://example.org"
+
+    assert navigate.url == "https://example.com"
+    assert isinstance(navigate.to_dict()["params"], dict)
+    assert json.loads(navigate.to_json_string())["params"] == {
+        "url": "https://example.com"
+    }
+
+    command = BrowserCommand("open_web_page", {"url": "https://example.com"})
+    command.params["url"] = "https://example.org"
+    assert command.to_dict()["params"] == {"url": "https://example.org"}
+
+
 @pytest.fixture
 def sample_click():
     """
@@ -726,6 +910,29 @@ def test_click_init_from_json_string():
     assert click.query_type == "xpath"
 
 
+def test_load_command():
+    """
+    Function to test loading commands of any type from json strings and dictionaries
+    """
+    click = load_command(
+        '{"command_name": "click", '
+        '"params": {"selector": "//button", "query_type": "xpath"}}'
+    )
+    assert isinstance(click, Click)
+    assert click.selector == "//button"
+
+    standard = load_command(
+        {"message_type": "standard", "message": {"role": "user", "content": "Hi"}}
+    )
+    assert isinstance(standard, Standard)
+    assert standard.content == "Hi"
+
+    with pytest.raises(TypeError):
+        load_command({"command_name": "invalid", "params": {}})
+    with pytest.raises(TypeError):
+        load_command({"message_type": "invalid", "message": {}})
+
+
 class TestMoveFile:
     """
     Class to test move_file function
@@ -762,6 +969,7 @@ class TestMoveFile:
         move_file(save_html_command, new_path)
         new_file_path = os.path.join(new_path, "body.txt")
         assert os.path.exists(new_file_path)
+        assert not save_html_command.exists
         with open(new_file_path, "r", encoding="utf-8") as file:
             assert file.read() == "Sample HTML content"
 
@@ -773,3 +981,19 @@ class TestMoveFile:
         assert os.path.exists(resources_directory)
         shutil.rmtree(resources_directory)
         assert not os.path.exists(resources_directory)
+
+
+def test_move_file_copy(tmpdir):
+    """
+    Function that tests that move_file can leave the original file in place
+    :param tmpdir: A temporary directory
+    """
+    save_html_command = SaveHtml(str(tmpdir))
+    with open(save_html_command.file_path, "w", encoding="utf-8") as file:
+        file.write("Sample HTML content")
+    new_path = tmpdir.mkdir("copied")
+
+    move_file(save_html_command, str(new_path), copy=True)
+    assert save_html_command.exists
+    with open(new_path.join("body.txt"), "r", encoding="utf-8") as file:
+        assert file.read() == "Sample HTML content"
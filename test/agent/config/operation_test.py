@@ -2,6 +2,8 @@
 Tests for operation.py
 """
 
+import copy
+import pickle
 import pytest
 from agent.config.operation import (
     Operation,
@@ -10,7 +12,19 @@ from agent.config.operation import (
     OpenAISettings,
     LLMOperations,
 )
-from agent.config.command import Command, Navigate
+from agent.config.command import (
+    Command,
+    Navigate,
+    FullPageScreenshot,
+    ElementScreenShot,
+    CollectNodes,
+    SaveHtml,
+    Sleep,
+    Click,
+    Standard,
+    Multimodal,
+    Assistant,
+)
 
 
 # pylint: disable= W0621
@@ -68,13 +82,14 @@ def test_operation_to_json_string(operation):
     operation.append(command1)
     operation.append(command2)
     expected_json_string = (
-        '{"type": "test_operation", '
-        '"settings": {}, '
-        '"command_list": [{"command_name": "command_name", '
-        '"params": {"params_key": "params_value"}}, {"command_name": '
-        '"command_name", "params": {"params_key": "params_value"}}]}'
+        '{"type":"test_operation",'
+        '"settings":{},'
+        '"command_list":[{"command_name":"command_name",'
+        '"params":{"params_key":"params_value"}},{"command_name":'
+        '"command_name","params":{"params_key":"params_value"}}]}'
     )
     assert operation.to_json_string() == expected_json_string
+    assert operation.to_json_bytes() == expected_json_string.encode("utf-8")
 
 
 @pytest.fixture
@@ -122,6 +137,30 @@ def test_get_settings_with_headless():
     assert browser_op.get_settings() == {"headless": True}
 
 
+def test_browser_operation_copy_and_pickle(browser_operation):
+    """
+    Function that tests that browser operations holding commands can be copied and pickled
+    :param browser_operation: A BrowserOperations object
+    """
+    for command in (
+        Navigate("https://example.com"),
+        FullPageScreenshot(90, "page.png", "snapshot"),
+        ElementScreenShot(1, "//div", "element.png", "snapshot"),
+        CollectNodes("//div", "snapshot", True),
+        SaveHtml("snapshot"),
+        Sleep(2),
+        Click("//button", "xpath"),
+    ):
+        browser_operation.append(command)
+
+    for copied in (
+        copy.copy(browser_operation),
+        copy.deepcopy(browser_operation),
+        pickle.loads(pickle.dumps(browser_operation)),
+    ):
+        assert copied.to_dict() == browser_operation.to_dict()
+
+
 def test_browser_operation_load_fps(browser_operation):
     """
     Function that tests the loading of a full page screenshot command
@@ -514,3 +553,22 @@ def test_llm_operation_load_with_invalid_command():
     }
     with pytest.raises(TypeError):
         BrowserOperations.load(data_dict)
+
+
+def test_llm_operations_copy_and_pickle(llm_operations):
+    """
+    Function that tests that LLM operations holding commands can be copied and pickled
+    :param llm_operations: An LLMOperations object
+    """
+    multimodal = Multimodal("user")
+    multimodal.add_content("text", "Describe this page")
+    llm_operations.append(Standard("user", "Hello"))
+    llm_operations.append(multimodal)
+    llm_operations.append(Assistant("assistant", "Hi"))
+
+    for copied in (
+        copy.copy(llm_operations),
+        copy.deepcopy(llm_operations),
+        pickle.loads(pickle.dumps(llm_operations)),
+    ):
+        assert copied.to_dict() == llm_operations.to_dict()